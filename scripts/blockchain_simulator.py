@@ -20,11 +20,19 @@ Author: MedChain Mavericks - Infosys Global Hackathon 2025
 from __future__ import annotations
 
 import hashlib
+import itertools
 import json
+import threading
 import time
+from array import array
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple, TypedDict
 
+try:
+    import orjson  # native JSON encoder, ~5-10x faster than stdlib
+except ImportError:  # pragma: no cover
+    orjson = None
+
 
 def utc_iso() -> str:
     """Return current UTC timestamp in ISO-8601 format."""
@@ -44,38 +52,104 @@ class Transaction(TypedDict):
 class Block:
     """Represents an immutable block in the blockchain."""
 
-    def __init__(self, index: int, transactions: List[Transaction], previous_hash: str):
+    def __init__(
+        self,
+        index: int,
+        transactions: List[Transaction],
+        previous_hash: str,
+        timestamp: Optional[str] = None,
+    ):
         self.index = index
-        self.timestamp: str = utc_iso()
+        # Callers that already hold a commit timestamp (e.g. a mining
+        # round) pass it in; otherwise stamp the block now.
+        self.timestamp: str = timestamp or utc_iso()
         self.transactions: List[Transaction] = transactions
         self.previous_hash = previous_hash
         self.nonce = 0
-        self.hash: str = self._calculate_hash()
+        self._hash_base = self._build_hash_base()
+        self.hash_bytes: bytes = self._calculate_digest()
 
     # --------------------------------------------------------------------- #
     # Proof-of-Work (extremely low difficulty – for demo only)
     # --------------------------------------------------------------------- #
     DIFFICULTY = 2  # leading ‘00’
 
-    def _calculate_hash(self) -> str:
-        block_string = json.dumps(
-            {
-                "index": self.index,
-                "timestamp": self.timestamp,
-                "transactions": self.transactions,
-                "previous_hash": self.previous_hash,
-                "nonce": self.nonce,
-            },
-            sort_keys=True,
-            separators=(",", ":"),
-        )
-        return hashlib.sha256(block_string.encode()).hexdigest()
+    def _build_hash_base(self) -> "hashlib._Hash":
+        """
+        Pre-absorb the nonce-invariant part of the block into a SHA-256
+        state.  Only the nonce changes between mining attempts, so each
+        attempt just copies this state and feeds it the nonce tail
+        instead of re-serialising and re-hashing the whole block.
+        """
+        fields = {
+            "index": self.index,
+            "timestamp": self.timestamp,
+            "transactions": self.transactions,
+            "previous_hash": self.previous_hash,
+        }
+        if orjson is not None:
+            prefix = orjson.dumps(fields, option=orjson.OPT_SORT_KEYS)
+        else:
+            prefix = json.dumps(
+                fields, sort_keys=True, separators=(",", ":")
+            ).encode()
+        # Drop the closing brace; the nonce field is appended per attempt.
+        return hashlib.sha256(prefix[:-1] + b',"nonce":')
+
+    def _calculate_digest(self) -> bytes:
+        h = self._hash_base.copy()
+        h.update(f"{self.nonce}}}".encode())
+        return h.digest()
+
+    @property
+    def hash(self) -> str:
+        """Hex form of the block hash, derived lazily from the raw digest."""
+        return self.hash_bytes.hex()
+
+    @staticmethod
+    def _meets_difficulty(digest: bytes) -> bool:
+        """Check DIFFICULTY leading hex zeros directly on the raw digest."""
+        zero_bytes, half = divmod(Block.DIFFICULTY, 2)
+        if digest[:zero_bytes] != b"\x00" * zero_bytes:
+            return False
+        return not half or digest[zero_bytes] < 0x10
 
     def mine(self) -> None:
-        target = "0" * Block.DIFFICULTY
-        while not self.hash.startswith(target):
+        # Byte-level comparison avoids allocating a 64-char hex string
+        # per nonce attempt
+        while not self._meets_difficulty(self.hash_bytes):
             self.nonce += 1
-            self.hash = self._calculate_hash()
+            self.hash_bytes = self._calculate_digest()
+
+    def _mine_parallel(self, n_threads: int = 8) -> None:
+        """
+        Threaded nonce search: worker *i* scans nonces i, i+n_threads, …
+        hashlib releases the GIL while hashing, so the workers genuinely
+        overlap; the first to hit the target wins and signals the rest.
+        """
+        found = threading.Event()
+        winners: List[Tuple[int, bytes]] = []
+
+        def _scan(start: int) -> None:
+            nonce = start
+            while not found.is_set():
+                h = self._hash_base.copy()
+                h.update(f"{nonce}}}".encode())
+                digest = h.digest()
+                if Block._meets_difficulty(digest):
+                    winners.append((nonce, digest))
+                    found.set()
+                    return
+                nonce += n_threads
+
+        threads = [
+            threading.Thread(target=_scan, args=(i,)) for i in range(n_threads)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.nonce, self.hash_bytes = winners[0]
 
     # Helpful representation when printing / debugging
     def summary(self) -> Dict:
@@ -88,6 +162,96 @@ class Block:
         }
 
 
+# ---------------------------------------------------------------------------#
+# World State (columnar)
+# ---------------------------------------------------------------------------#
+class _WorldState:
+    """
+    Columnar (struct-of-arrays) store for the latest batch view.
+
+    Instead of one Python dict per batch, every field lives in its own
+    typed column with a ``batch_id -> row`` index for O(1) updates.
+    Numeric fields use packed ``array`` storage (int32 quantity, int8
+    status code, int64 epoch seconds) and status strings are
+    dictionary-encoded, so memory per batch stays small and whole-column
+    scans stay cheap.  Dicts are only materialised on demand.
+    """
+
+    def __init__(self) -> None:
+        self._index: Dict[str, int] = {}
+        self._batch_ids: List[str] = []
+        self._drug_names: List[str] = []
+        self._manufacturers: List[str] = []
+        self._quantities = array("i")
+        self._status_codes = array("b")
+        self._timestamps = array("q")  # epoch seconds (UTC)
+        self._status_lookup: Dict[str, int] = {}
+        self._status_names: List[str] = []
+
+    def __contains__(self, batch_id: str) -> bool:
+        return batch_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _status_code(self, status: str) -> int:
+        code = self._status_lookup.get(status)
+        if code is None:
+            code = len(self._status_names)
+            self._status_lookup[status] = code
+            self._status_names.append(status)
+        return code
+
+    @staticmethod
+    def _epoch(timestamp: str) -> int:
+        return int(datetime.fromisoformat(timestamp).timestamp())
+
+    def upsert(
+        self,
+        batch_id: str,
+        drug_name: str,
+        manufacturer: str,
+        quantity: int,
+        status: str,
+        timestamp: str,
+    ) -> None:
+        row = self._index.get(batch_id)
+        if row is None:
+            self._index[batch_id] = len(self._batch_ids)
+            self._batch_ids.append(batch_id)
+            self._drug_names.append(drug_name)
+            self._manufacturers.append(manufacturer)
+            self._quantities.append(quantity)
+            self._status_codes.append(self._status_code(status))
+            self._timestamps.append(self._epoch(timestamp))
+        else:
+            self._drug_names[row] = drug_name
+            self._manufacturers[row] = manufacturer
+            self._quantities[row] = quantity
+            self._status_codes[row] = self._status_code(status)
+            self._timestamps[row] = self._epoch(timestamp)
+
+    def set_status(self, batch_id: str, status: str, timestamp: str) -> None:
+        row = self._index[batch_id]
+        self._status_codes[row] = self._status_code(status)
+        self._timestamps[row] = self._epoch(timestamp)
+
+    def _row(self, row: int) -> Dict:
+        ts = datetime.fromtimestamp(self._timestamps[row], tz=timezone.utc)
+        return {
+            "batch_id": self._batch_ids[row],
+            "drug_name": self._drug_names[row],
+            "manufacturer": self._manufacturers[row],
+            "quantity": self._quantities[row],
+            "status": self._status_names[self._status_codes[row]],
+            "timestamp": ts.isoformat(timespec="seconds"),
+        }
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Materialise the batch_id -> record mapping for viewers."""
+        return {bid: self._row(row) for bid, row in self._index.items()}
+
+
 # ---------------------------------------------------------------------------#
 # Blockchain Simulator
 # ---------------------------------------------------------------------------#
@@ -97,7 +261,7 @@ class MedChainBlockchain:
 
         • chain         -> list of Block
         • pending_txs   -> list awaiting mining
-        • world_state   -> dict keyed by batch_id
+        • world_state   -> columnar store keyed by batch_id
     """
 
     # --------------------------------------------------------------------- #
@@ -106,7 +270,8 @@ class MedChainBlockchain:
     def __init__(self) -> None:
         self.chain: List[Block] = []
         self.pending_transactions: List[Transaction] = []
-        self.world_state: Dict[str, Dict] = {}  # latest KV store
+        self.world_state = _WorldState()  # latest KV store (columnar)
+        self._tx_counter = itertools.count()
         self._create_genesis_block()
 
     def _create_genesis_block(self) -> None:
@@ -118,13 +283,17 @@ class MedChainBlockchain:
     # --------------------------------------------------------------------- #
     # Internal helpers
     # --------------------------------------------------------------------- #
-    def _new_tx(self, tx_type: str, payload: Dict) -> Transaction:
-        tx_id = f"TX-{int(time.time() * 1000)}-{hashlib.md5(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:8]}"
+    def _new_tx(
+        self, tx_type: str, payload: Dict, timestamp: Optional[str] = None
+    ) -> Transaction:
+        # Monotonic counter + nanosecond clock is unique without hashing
+        # the payload on every transaction
+        tx_id = f"TX-{time.time_ns()}-{next(self._tx_counter):08x}"
         return {
             "tx_id": tx_id,
             "type": tx_type,
             "payload": payload,
-            "timestamp": utc_iso(),
+            "timestamp": timestamp or utc_iso(),
         }
 
     def _mine_pending(self) -> str:
@@ -132,14 +301,19 @@ class MedChainBlockchain:
         if not self.pending_transactions:
             return self.chain[-1].hash  # nothing to mine
 
+        # Hand the pending list over to the block and start a fresh one;
+        # no need to copy what we are about to clear anyway.
+        transactions = self.pending_transactions
+        self.pending_transactions = []
+
         new_block = Block(
             index=len(self.chain),
-            transactions=self.pending_transactions.copy(),
+            transactions=transactions,
             previous_hash=self.chain[-1].hash,
+            timestamp=utc_iso(),  # single commit time for the whole round
         )
         new_block.mine()
         self.chain.append(new_block)
-        self.pending_transactions.clear()
         return new_block.hash
 
     # --------------------------------------------------------------------- #
@@ -164,7 +338,9 @@ class MedChainBlockchain:
         self.pending_transactions.append(tx)
 
         # Update world state immediately (Fabric endorsing peers do similar)
-        self.world_state[batch_id] = {**payload, "timestamp": tx["timestamp"]}
+        self.world_state.upsert(
+            batch_id, drug_name, manufacturer, quantity, status, tx["timestamp"]
+        )
 
         return tx["tx_id"]
 
@@ -177,8 +353,7 @@ class MedChainBlockchain:
         self.pending_transactions.append(tx)
 
         # Mutate world state
-        self.world_state[batch_id]["status"] = status
-        self.world_state[batch_id]["timestamp"] = tx["timestamp"]
+        self.world_state.set_status(batch_id, status, tx["timestamp"])
         return tx["tx_id"]
 
     # --------------------------------------------------------------------- #
@@ -193,8 +368,10 @@ class MedChainBlockchain:
         return [blk.summary() for blk in self.chain]
 
     def world_state_view(self) -> Dict:
-        """Return a deep-copied world state (safe for JSON)."""
-        return json.loads(json.dumps(self.world_state))
+        """Return the world state as fresh dicts (safe for JSON)."""
+        # Rows are materialised on demand from the columnar store, so
+        # the result is already isolated from internal state.
+        return self.world_state.to_dict()
 
     # --------------------------------------------------------------------- #
     # Simple demo run when executed directly
